@@ -3,10 +3,17 @@
 # https://github.com/wpilibsuite/allwpilib/blob/main/wpiutil/examples/printlog/datalog.py
 
 import array
+import re
 import struct
 from typing import List, SupportsBytes
 
-__all__ = ["StartRecordData", "MetadataRecordData", "DataLogRecord", "DataLogReader"]
+__all__ = [
+    "StartRecordData",
+    "MetadataRecordData",
+    "DataLogRecord",
+    "DataLogRecoveringIterator",
+    "DataLogReader",
+]
 
 floatStruct = struct.Struct("<f")
 doubleStruct = struct.Struct("<d")
@@ -15,6 +22,13 @@ kControlStart = 0
 kControlFinish = 1
 kControlSetMetadata = 2
 
+# Limits used to tell real record headers apart from corrupted bytes
+kMaxTimestampRewind = 60 * 1000000
+kMaxTimestampJump = 60 * 60 * 1000000
+kMaxTimestampStep = 1000000
+kNonZero = re.compile(rb"[^\x00]")
+kFixedSizes = {"boolean": 1, "float": 4, "double": 8, "int64": 8}
+
 
 class StartRecordData:
     """Data contained in a start control record as created by DataLog.start() when
@@ -209,6 +223,206 @@ class DataLogIterator:
         return record
 
 
+class DataLogRecoveringIterator(DataLogIterator):
+    """DataLogReader iterator that skips past corrupted or truncated regions.
+
+    Every record header is checked against the entries started so far, the size of
+    fixed-size types, and the last confirmed timestamp. A timestamp that jumps forward
+    is only confirmed once the next header agrees with it, and data records whose
+    timestamp disagrees with their neighbours are skipped. When a header is rejected,
+    the iterator scans forward for the next position where two consecutive headers
+    are valid and continues from there. Well-formed records of entries whose start
+    record was lost are skipped without scanning.
+    skippedBytes: Number of bytes that could not be decoded.
+    skippedRegions: Number of corrupted regions that were skipped.
+    skippedRecords: Number of well-formed records that were skipped.
+    """
+
+    def __init__(self, buf: SupportsBytes, pos: int):
+        super().__init__(buf, pos)
+        self.entrySizes = {}
+        self.lastTimestamp = None
+        self.skippedBytes = 0
+        self.skippedRegions = 0
+        self.skippedRecords = 0
+
+    def _readHeader(
+        self, pos: int, reference=None, entrySizes=None, allowUnknown=False
+    ):
+        """Returns the header length, entry, size and timestamp of the record at pos,
+        or None if the header is not plausible. The timestamp is checked against the
+        reference timestamp if one is given, and entries are checked against
+        entrySizes, which defaults to the entries started so far."""
+        buf = self.buf
+        if len(buf) < pos + 4 or buf[pos] & 0x80:
+            return None
+        entryLen = (buf[pos] & 0x3) + 1
+        sizeLen = ((buf[pos] >> 2) & 0x3) + 1
+        timestampLen = ((buf[pos] >> 4) & 0x7) + 1
+        headerLen = 1 + entryLen + sizeLen + timestampLen
+        if len(buf) < pos + headerLen:
+            return None
+        entry = self._readVarInt(pos + 1, entryLen)
+        size = self._readVarInt(pos + 1 + entryLen, sizeLen)
+        if len(buf) < pos + headerLen + size:
+            return None
+        if entrySizes is None:
+            entrySizes = self.entrySizes
+        if entry == 0:
+            if not self._isValidControl(pos, headerLen, size):
+                return None
+        elif entry not in entrySizes:
+            if not allowUnknown:
+                return None
+        elif entrySizes[entry] not in (None, size):
+            return None
+        timestamp = self._readVarInt(pos + 1 + entryLen + sizeLen, timestampLen)
+        if reference is not None and not (
+            reference - kMaxTimestampRewind
+            <= timestamp
+            <= reference + kMaxTimestampJump
+        ):
+            return None
+        return headerLen, entry, size, timestamp
+
+    def _isValidControl(self, pos: int, headerLen: int, size: int) -> bool:
+        record = DataLogRecord(0, 0, self.buf[pos + headerLen : pos + headerLen + size])
+        try:
+            if record.isStart():
+                record.getStartData()
+            elif record.isSetMetadata():
+                record.getSetMetadataData()
+            elif not record.isFinish():
+                return False
+        except (TypeError, UnicodeDecodeError):
+            return False
+        return True
+
+    def _readStart(self, pos: int, headerLen: int, size: int):
+        """Returns the data of the start record at pos, or None if it isn't one."""
+        record = DataLogRecord(0, 0, self.buf[pos + headerLen : pos + headerLen + size])
+        if not record.isStart():
+            return None
+        try:
+            return record.getStartData()
+        except (TypeError, UnicodeDecodeError):
+            return None
+
+    def _isSyncPoint(self, pos: int) -> bool:
+        header = self._readHeader(pos, self.lastTimestamp)
+        if header is None:
+            return False
+        headerLen, entry, size, timestamp = header
+        nextPos = pos + headerLen + size
+        if nextPos == len(self.buf):
+            return True
+        entrySizes = None
+        # The record after a start record is often the first one of its entry
+        if entry == 0:
+            data = self._readStart(pos, headerLen, size)
+            if data is not None:
+                entrySizes = dict(self.entrySizes)
+                entrySizes[data.entry] = kFixedSizes.get(data.type, None)
+        # Records of entries whose start record was lost are skipped, so they can
+        # follow a sync point
+        return (
+            self._readHeader(nextPos, timestamp, entrySizes, allowUnknown=True)
+            is not None
+        )
+
+    def _resync(self):
+        buf = self.buf
+        end = len(buf)
+        start = self.pos
+        pos = start + 1
+        while pos < end:
+            header = buf[pos]
+            if header == 0:
+                # Zero-filled regions are common after a power cut, so skip them at
+                # once, keeping the two zero bytes a record header can start with
+                match = kNonZero.search(buf, pos)
+                nonZero = end if match is None else match.start()
+                if nonZero - 2 > pos:
+                    pos = nonZero - 2
+                    continue
+            # Cheap checks before fully validating the candidate
+            if header & 0x80:
+                pos += 1
+                continue
+            entryLen = (header & 0x3) + 1
+            entry = int.from_bytes(
+                buf[pos + 1 : pos + 1 + entryLen], byteorder="little", signed=False
+            )
+            if entry != 0 and entry not in self.entrySizes:
+                pos += 1
+                continue
+            if self._isSyncPoint(pos):
+                break
+            pos += 1
+        pos = min(pos, end)
+        self.skippedBytes += pos - start
+        self.skippedRegions += 1
+        self.pos = pos
+
+    def _confirmTimestamp(self, nextPos: int, timestamp: int):
+        """Returns True if the timestamp agrees with the next header, False if only the
+        last confirmed timestamp does, or None if the next header can't tell."""
+        if (
+            self.lastTimestamp is not None
+            and timestamp <= self.lastTimestamp + kMaxTimestampStep
+        ):
+            return True
+        if nextPos >= len(self.buf):
+            return True
+        if self._readHeader(nextPos, timestamp, allowUnknown=True) is not None:
+            return True
+        if self._readHeader(nextPos, self.lastTimestamp, allowUnknown=True) is not None:
+            return False
+        return None
+
+    def __next__(self) -> DataLogRecord:
+        while True:
+            if self.pos >= len(self.buf):
+                raise StopIteration
+            header = self._readHeader(self.pos, self.lastTimestamp, allowUnknown=True)
+            if header is None:
+                self._resync()
+                continue
+            headerLen, entry, size, timestamp = header
+            nextPos = self.pos + headerLen + size
+            if entry != 0 and entry not in self.entrySizes:
+                # Only trust a record of an unknown entry if the next header is valid
+                if (
+                    nextPos == len(self.buf)
+                    or self._readHeader(nextPos, self.lastTimestamp, allowUnknown=True)
+                    is not None
+                ):
+                    self.skippedRecords += 1
+                    self.pos = nextPos
+                else:
+                    self._resync()
+                continue
+            confirmed = self._confirmTimestamp(nextPos, timestamp)
+            if confirmed is False and entry != 0:
+                # The timestamp of this record was corrupted
+                self.skippedRecords += 1
+                self.pos = nextPos
+                continue
+            record = DataLogRecord(
+                entry, timestamp, self.buf[self.pos + headerLen : nextPos]
+            )
+            if entry == 0 and record.isStart():
+                data = self._readStart(self.pos, headerLen, size)
+                if data is None:
+                    self._resync()
+                    continue
+                self.entrySizes[data.entry] = kFixedSizes.get(data.type, None)
+            if confirmed:
+                self.lastTimestamp = timestamp
+            self.pos = nextPos
+            return record
+
+
 class DataLogReader:
     """Data log reader (reads logs written by the DataLog class)."""
 
@@ -248,3 +462,12 @@ class DataLogReader:
             self.buf[8:12], byteorder="little", signed=False
         )
         return DataLogIterator(self.buf, 12 + extraHeaderSize)
+
+    def recover(self) -> DataLogRecoveringIterator:
+        """Iterates over the records of a possibly corrupted or truncated log.
+        @return Iterator that skips records that can't be decoded
+        """
+        extraHeaderSize = int.from_bytes(
+            self.buf[8:12], byteorder="little", signed=False
+        )
+        return DataLogRecoveringIterator(self.buf, 12 + extraHeaderSize)
@@ -7,6 +7,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 
 from cougar_log.data_log_reader import DataLogReader
+from cougar_log.signal_store import SignalStore, is_signal_store
 
 HEADER_LIST = ["Timestamp", "Name", "Value"]
 
@@ -19,7 +20,13 @@ def exclude_from_dataframe(dataframe: pd.DataFrame, name_to_exclude: str):
     return dataframe.loc[dataframe[HEADER_LIST[1]] != name_to_exclude]
 
 
-def read_log_to_dataframe(input_path: Path):
+def read_log_to_dataframe(
+    input_path: Path,
+    recover: bool = False,
+    name_filter: str = None,
+    start: float = None,
+    end: float = None,
+):
     if input_path is None:
         return [None, "No input file provided"]
 
@@ -28,7 +35,9 @@ def read_log_to_dataframe(input_path: Path):
         if input_path.suffix != ".wpilog":
             return [None, "Invalid file format provided. Try providing a .wpilog file."]
 
-        [output, error] = convert_data_log_to_list(input_path=input_path)
+        [output, error] = convert_data_log_to_list(
+            input_path=input_path, recover=recover
+        )
 
         if error is not None:
             return [None, error]
@@ -38,37 +47,55 @@ def read_log_to_dataframe(input_path: Path):
 
         log_dataframe.columns = HEADER_LIST
 
+        if name_filter is not None:
+            log_dataframe = filter_dataframe(log_dataframe, name_filter=name_filter)
+
+        if start is not None:
+            log_dataframe = log_dataframe.loc[log_dataframe[HEADER_LIST[0]] >= start]
+
+        if end is not None:
+            log_dataframe = log_dataframe.loc[log_dataframe[HEADER_LIST[0]] <= end]
+
         return [log_dataframe, error]
 
     elif input_path.is_dir():
+        # Read previously decoded logs directly from their memory-mapped columns
+        if is_signal_store(input_path):
+            return [SignalStore(input_path).to_dataframe(name_filter, start, end), None]
+
         return [None, "The given input file is a directory."]
     elif not input_path.exists():
         return [None, "The input file doesn't exist"]
 
 
-def convert_data_log_to_list(input_path: str):
+def convert_data_log_to_list(input_path: str, recover: bool = False):
     import mmap
 
     output = []
 
     error = None
 
-    error_message = "Invalid file, verify that the file is a wpilog or try downloading the log file again."
+    error_message = "Invalid file, verify that the file is a wpilog or try downloading the log file again. Use --recover to skip past corrupted parts of the log."
+
+    invalid_records = 0
 
     with open(input_path, "r") as f:
         mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         reader = DataLogReader(mm)
 
+        # Skip past corrupted and truncated regions instead of stopping at them
+        records = reader.recover() if recover else reader
+
         entries = {}
 
-        for record in reader:
+        for record in records:
             # Store all record starting data in the entries dictionary
             if record.isStart():
                 try:
                     data = record.getStartData()
                     entries[data.entry] = data
-                except TypeError as e:
-                    error = error_message
+                except (TypeError, UnicodeDecodeError) as e:
+                    invalid_records += 1
 
             # Delete the finish entry of the current record
             elif record.isFinish():
@@ -77,18 +104,18 @@ def convert_data_log_to_list(input_path: str):
                     if entry in entries:
                         del entries[entry]
                 except TypeError as e:
-                    error = error_message
+                    invalid_records += 1
 
             # Verify any available metadata
             elif record.isSetMetadata():
                 try:
                     data = record.getSetMetadataData()
-                except TypeError as e:
-                    error = error_message
+                except (TypeError, UnicodeDecodeError) as e:
+                    invalid_records += 1
 
             # Verify that the type of the record is recognized
             elif record.isControl():
-                error = error_message
+                invalid_records += 1
 
             # Extract and store the information from the current record
             else:
@@ -97,7 +124,21 @@ def convert_data_log_to_list(input_path: str):
                 if entry is None:
                     continue
 
-                output.append(extract_value_from_entry(entry, record))
+                try:
+                    output.append(extract_value_from_entry(entry, record))
+                except (TypeError, UnicodeDecodeError) as e:
+                    invalid_records += 1
+
+    if recover:
+        invalid_records += records.skippedRecords
+
+        typer.echo(
+            f"Recovered {len(output)} records from '{input_path}', skipping "
+            f"{records.skippedBytes} bytes in {records.skippedRegions} corrupted regions "
+            f"and {invalid_records} invalid records."
+        )
+    elif invalid_records > 0:
+        error = error_message
 
     return [output, error]
 
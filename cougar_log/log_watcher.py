@@ -0,0 +1,210 @@
+import time
+from pathlib import Path
+from typing import Callable
+
+from paramiko import SSHException
+
+from cougar_log.ssh_download import RobotSSHInterface
+
+# Number of bytes compared at the start and end of a local file before resuming it
+VERIFY_SIZE = 4096
+
+# Errors raised when the robot can't be reached or the connection drops
+CONNECTION_ERRORS = (OSError, SSHException, EOFError)
+
+
+class RobotLogWatcher:
+    """Robot Log Watcher keeps a connection to the robot open and downloads log files as soon as they are closed."""
+
+    def __init__(
+        self,
+        create_interface: Callable[[], RobotSSHInterface],
+        source_directory: str,
+        target_directory: str,
+        remove_files: bool,
+        poll_interval: float = 5.0,
+        max_backoff: float = 60.0,
+        remove_delay: float = 60.0,
+        on_event: Callable[[str], None] = print,
+    ):
+        self.create_interface = create_interface
+
+        self.source_directory = source_directory
+        self.target_directory = target_directory
+        self.remove_files = remove_files
+
+        self.poll_interval = poll_interval
+        self.max_backoff = max_backoff
+        self.remove_delay = remove_delay
+        self.on_event = on_event
+
+        self.interface = None
+
+        # Size and modification time of each remote log file at the previous poll
+        self.remote_files = {}
+
+        # Time at which each remote log file was last seen changing
+        self.changed_at = {}
+
+        # Number of bytes of each log file that are already saved locally
+        self.downloaded_sizes = {
+            path.name: path.stat().st_size
+            for path in Path(target_directory).glob("*.wpilog")
+        }
+
+        # Log files transferred by this watcher, which are the only ones it removes
+        self.transferred = set()
+
+        # Local files saved before this watcher started that match the robot's file
+        self.verified = set()
+
+        # Local files that don't match the robot's file with the same name
+        self.conflicts = set()
+
+    def connect(self):
+        if self.interface is None:
+            self.interface = self.create_interface()
+        elif not self.interface.is_connected():
+            self.interface.connect()
+        else:
+            return
+
+        self.on_event("Connected to the robot.")
+
+    def poll(self):
+        """Checks the robot once and downloads every new or grown log file that has
+        not changed since the previous poll. Returns the names of the downloaded files.
+        """
+        self.connect()
+
+        try:
+            files = self.interface.list_log_files(self.source_directory)
+        except FileNotFoundError:
+            # The robot program creates the log directory when it first starts logging
+            files = {}
+
+        downloaded = []
+        removed = []
+
+        now = time.monotonic()
+
+        # The newest log may still be open on the robot even if it isn't changing
+        newest = max(files, key=lambda file_name: files[file_name][1], default=None)
+
+        for file_name, stats in files.items():
+            size = stats[0]
+            downloaded_size = self.downloaded_sizes.get(file_name, 0)
+
+            # Files that are still changing are being written to by the robot
+            if self.remote_files.get(file_name) != stats:
+                self.changed_at[file_name] = now
+                continue
+
+            if file_name in self.conflicts:
+                continue
+
+            # Only resume files saved before this watcher started if they are the same log
+            if (
+                file_name in self.downloaded_sizes
+                and file_name not in self.transferred
+                and file_name not in self.verified
+            ):
+                if not self._matches_local_file(file_name, size):
+                    self.conflicts.add(file_name)
+                    self.on_event(
+                        f"Skipping '{file_name}', it doesn't match the local file with the same name."
+                    )
+                    continue
+
+                self.verified.add(file_name)
+
+            if size != downloaded_size:
+                # Only transfer the new bytes of a grown file
+                offset = downloaded_size if size > downloaded_size else 0
+
+                self.interface.download_file(
+                    self.source_directory, file_name, self.target_directory, offset
+                )
+
+                self.downloaded_sizes[file_name] = size
+                self.transferred.add(file_name)
+                downloaded.append(file_name)
+
+            if (
+                self.remove_files
+                and file_name in self.transferred
+                and file_name != newest
+                and now - self.changed_at.get(file_name, now) >= self.remove_delay
+            ):
+                self.interface.remove_file(self.source_directory, file_name)
+                removed.append(file_name)
+
+        self.remote_files = {
+            file_name: stats
+            for file_name, stats in files.items()
+            if file_name not in removed
+        }
+
+        self.changed_at = {
+            file_name: changed_at
+            for file_name, changed_at in self.changed_at.items()
+            if file_name in self.remote_files
+        }
+
+        return downloaded
+
+    def run(self):
+        """Polls the robot until interrupted, reconnecting with an increasing delay
+        whenever the robot can't be reached."""
+        backoff = self.poll_interval
+
+        while True:
+            try:
+                for file_name in self.poll():
+                    self.on_event(f"Downloaded '{file_name}'")
+            except CONNECTION_ERRORS as e:
+                self.on_event(f"Error while watching the robot: {e}")
+                self.close()
+
+                self.on_event(f"Retrying in {backoff:g}s.")
+
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.poll_interval
+
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        if self.interface is None:
+            return
+
+        try:
+            self.interface.close_interface()
+        except CONNECTION_ERRORS:
+            pass
+
+    def _matches_local_file(self, file_name: str, size: int):
+        local_path = Path(self.target_directory, file_name)
+        local_size = local_path.stat().st_size
+
+        if local_size > size:
+            return False
+
+        # Compare the header and the bytes just before where the download would resume
+        tail_offset = max(0, local_size - VERIFY_SIZE)
+
+        with open(local_path, "rb") as f:
+            head = f.read(VERIFY_SIZE)
+            f.seek(tail_offset)
+            tail = f.read(VERIFY_SIZE)
+
+        return self.interface.read_file(
+            self.source_directory, file_name, 0, len(head)
+        ) == head and (
+            self.interface.read_file(
+                self.source_directory, file_name, tail_offset, len(tail)
+            )
+            == tail
+        )
@@ -6,10 +6,11 @@ import typer
 from cougar_log.log_helpers import (
     HEADER_LIST,
     exclude_from_dataframe,
-    filter_dataframe,
     plot_dataframe,
     read_log_to_dataframe,
 )
+from cougar_log.log_watcher import RobotLogWatcher
+from cougar_log.signal_store import is_signal_store, write_signal_store
 from cougar_log.ssh_download import RobotSSHInterface
 
 app = typer.Typer()
@@ -47,6 +48,12 @@ def convert(
         "-t",
         help="Whether or not to include system time in the output.",
     ),
+    recover: bool = typer.Option(
+        False,
+        "--recover",
+        "-r",
+        help="Whether or not to skip past corrupted or truncated parts of the log instead of failing.",
+    ),
 ):
     """
     This command will convert a given wpilog file or directory of files into csv files.
@@ -54,28 +61,31 @@ def convert(
     Optionally use filter to select only log entries containing a given name.
     """
     # Convert all files in the given directory, or convert just a single given file.
-    if input_path.is_dir():
+    if input_path.is_dir() and not is_signal_store(input_path):
         for file in input_path.iterdir():
             # Convert all valid files within the given folder
             if file.is_dir() or not file.is_file() or file.suffix != ".wpilog":
                 continue
             else:
-                convert_file(file, None, name_filter, include_system_time)
+                convert_file(file, None, name_filter, include_system_time, recover)
     else:
-        convert_file(input_path, output_path, name_filter, include_system_time)
+        convert_file(input_path, output_path, name_filter, include_system_time, recover)
 
 
 def convert_file(
-    input_path: Path, output_path: Path, name_filter: str, include_system_time: bool
+    input_path: Path,
+    output_path: Path,
+    name_filter: str,
+    include_system_time: bool,
+    recover: bool,
 ):
-    [log_dataframe, error] = read_log_to_dataframe(input_path=input_path)
+    [log_dataframe, error] = read_log_to_dataframe(
+        input_path=input_path, recover=recover, name_filter=name_filter
+    )
 
     if error is not None:
         exit_with_error(error)
 
-    if name_filter is not None:
-        log_dataframe = filter_dataframe(log_dataframe, name_filter=name_filter)
-
     if not include_system_time:
         log_dataframe = exclude_from_dataframe(
             log_dataframe, name_to_exclude="systemTime"
@@ -110,20 +120,39 @@ def table(
         "-t",
         help="Whether or not to include system time in the output.",
     ),
+    recover: bool = typer.Option(
+        False,
+        "--recover",
+        "-r",
+        help="Whether or not to skip past corrupted or truncated parts of the log instead of failing.",
+    ),
+    start: float = typer.Option(
+        None,
+        "--start",
+        help="Only include log entries at or after this timestamp, in seconds.",
+    ),
+    end: float = typer.Option(
+        None,
+        "--end",
+        help="Only include log entries at or before this timestamp, in seconds.",
+    ),
 ):
     """
     This command will display the contents of a wpilog file in a table.
 
     Optionally use filter to select only logs containing a given name.
     """
-    [log_dataframe, error] = read_log_to_dataframe(input_path=input_path)
+    [log_dataframe, error] = read_log_to_dataframe(
+        input_path=input_path,
+        recover=recover,
+        name_filter=name_filter,
+        start=start,
+        end=end,
+    )
 
     if error is not None:
         exit_with_error(error)
 
-    if name_filter is not None:
-        log_dataframe = filter_dataframe(log_dataframe, name_filter=name_filter)
-
     if not include_system_time:
         log_dataframe = exclude_from_dataframe(
             log_dataframe, name_to_exclude="systemTime"
@@ -149,25 +178,104 @@ def graph(
         "-f",
         help="Filter by a specific name in the logs.",
     ),
+    recover: bool = typer.Option(
+        False,
+        "--recover",
+        "-r",
+        help="Whether or not to skip past corrupted or truncated parts of the log instead of failing.",
+    ),
+    start: float = typer.Option(
+        None,
+        "--start",
+        help="Only include log entries at or after this timestamp, in seconds.",
+    ),
+    end: float = typer.Option(
+        None,
+        "--end",
+        help="Only include log entries at or before this timestamp, in seconds.",
+    ),
 ):
     """
     This command will display the contents of a wpilog file in a graph.
 
     Optionally use filter to select only logs containing a given name.
     """
-    [log_dataframe, error] = read_log_to_dataframe(input_path=input_path)
+    [log_dataframe, error] = read_log_to_dataframe(
+        input_path=input_path,
+        recover=recover,
+        name_filter=name_filter,
+        start=start,
+        end=end,
+    )
 
     if error is not None:
         exit_with_error(error)
 
-    if name_filter is not None:
-        log_dataframe = filter_dataframe(log_dataframe, name_filter=name_filter)
-
     typer.echo("Creating a graph from the given log.")
 
     plot_dataframe(log_dataframe)
 
 
+@app.command()
+def store(
+    input_path: Path = typer.Option(
+        None,
+        "--input",
+        "-i",
+        prompt="Enter the path to the file to store",
+        help="The file provided to store.",
+    ),
+    output_path: Path = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="The name of the resulting store directory.",
+    ),
+    recover: bool = typer.Option(
+        False,
+        "--recover",
+        "-r",
+        help="Whether or not to skip past corrupted or truncated parts of the log instead of failing.",
+    ),
+):
+    """
+    This command will decode a wpilog file into a directory of memory-mapped columns.
+
+    The resulting directory can be given to the table, graph and convert commands in place of the log file.
+    """
+    if input_path.suffix != ".wpilog" or not input_path.is_file():
+        exit_with_error("Invalid file format provided. Try providing a .wpilog file.")
+
+    if output_path is None:
+        output_path = Path(input_path.stem)
+
+    [manifest, error] = write_signal_store(input_path, output_path, recover)
+
+    if error is not None:
+        exit_with_error(error)
+
+    for entry in manifest["skipped"]:
+        typer.echo(
+            f"Warning: skipped '{entry['name']}' ({entry['type']}), {entry['reason']}"
+        )
+
+    if recover:
+        typer.echo(
+            f"Recovered the log, skipping {manifest['skipped_bytes']} bytes in "
+            f"{manifest['skipped_regions']} corrupted regions and "
+            f"{manifest['invalid_records']} invalid records."
+        )
+    elif manifest["unread_bytes"] > 0:
+        typer.echo(
+            f"Warning: the last {manifest['unread_bytes']} bytes of the log could not be read. "
+            "Use --recover to skip past corrupted parts of the log."
+        )
+    elif manifest["invalid_records"] > 0:
+        typer.echo(f"Warning: skipped {manifest['invalid_records']} invalid records.")
+
+    typer.echo(f"Successfully stored the log in '{output_path}'")
+
+
 @app.command()
 def download(
     directory: str = typer.Option(
@@ -234,3 +342,81 @@ def download(
     typer.echo("Download complete!")
 
     interface.close_interface()
+
+
+@app.command()
+def watch(
+    directory: str = typer.Option(
+        ".",
+        "--directory",
+        "-d",
+        help="The directory to download files from.",
+    ),
+    save_directory: str = typer.Option(
+        "./logs",
+        "--save-directory",
+        "-s",
+        help="The directory to save downloaded files in.",
+    ),
+    remove: bool = typer.Option(
+        False,
+        help="Whether or not to delete log files from the robot after downloading them.",
+    ),
+    host: str = typer.Option(
+        None,
+        "--host",
+        "-h",
+        prompt="Enter the host to connect to (ip/hostname)",
+        help="The host to download files from.",
+    ),
+    user: str = typer.Option(
+        "lvuser",
+        "--user",
+        "-u",
+        help="The user to authenticate as.",
+    ),
+    password: str = typer.Option(
+        "",
+        help="The password used for connecting to the robot. By default FRC robots have no password.",
+    ),
+    port: int = typer.Option(
+        22,
+        "--port",
+        "-p",
+        help="The port to use for the ssh connection.",
+    ),
+    interval: float = typer.Option(
+        5.0,
+        "--interval",
+        "-n",
+        help="The number of seconds to wait between checks for new log files.",
+    ),
+    remove_delay: float = typer.Option(
+        60.0,
+        "--remove-delay",
+        help="The number of seconds a downloaded log must stay unchanged before it is deleted from the robot. The newest log is never deleted.",
+    ),
+):
+    """
+    This command will stay connected to a robot and download new log files as soon as the robot finishes writing them.
+
+    Files that grow after being downloaded are updated, and the robot is reconnected to automatically if it goes offline.
+    """
+    watcher = RobotLogWatcher(
+        lambda: RobotSSHInterface(host, user, password, port, remove_files=remove),
+        source_directory=directory,
+        target_directory=save_directory,
+        remove_files=remove,
+        poll_interval=interval,
+        remove_delay=remove_delay,
+        on_event=typer.echo,
+    )
+
+    typer.echo(f"Watching '{host}' for new log files, press Ctrl+C to stop.")
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        typer.echo("Stopped watching.")
+    finally:
+        watcher.close()
@@ -0,0 +1,497 @@
+import json
+import mmap
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from cougar_log.data_log_reader import DataLogReader, DataLogRecord
+
+MANIFEST_NAME = "manifest.json"
+STORE_VERSION = 1
+
+# Entry types stored as one fixed-size value per record
+SCALAR_DTYPES = {
+    "double": "<f8",
+    "float": "<f4",
+    "int64": "<i8",
+    "boolean": "u1",
+}
+
+# Entry types stored as a flat value column plus an offsets column
+ARRAY_DTYPES = {
+    "double[]": "<f8",
+    "float[]": "<f4",
+    "int64[]": "<i8",
+    "boolean[]": "u1",
+    "string": "u1",
+    "json": "u1",
+    "string[]": "u1",
+}
+
+# string[] entries also store the byte offsets of each string in an extra column
+STRING_ARRAY_TYPE = "string[]"
+
+# Number of buffered bytes of a column before they are appended to disk
+FLUSH_SIZE = 1 << 16
+
+
+def is_signal_store(path: Path):
+    return Path(path, MANIFEST_NAME).is_file()
+
+
+def write_signal_store(input_path: Path, store_path: Path, recover: bool = False):
+    """Decodes a wpilog file and saves every supported entry as a directory of
+    .npy column files that can be memory-mapped by SignalStore.
+
+    Returns the manifest of the store, which lists the entries that could not be
+    stored and how much of the log was skipped, along with an error if any."""
+    store_path = Path(store_path)
+
+    created = not store_path.exists()
+
+    try:
+        store_path.mkdir(parents=True, exist_ok=True)
+    except:
+        return [None, "Could not create the store directory in the target location."]
+
+    [columns, report, error] = _write_entry_columns(input_path, store_path, recover)
+
+    if error is not None:
+        # Don't leave an empty store directory behind
+        if created and not any(store_path.iterdir()):
+            store_path.rmdir()
+
+        return [None, error]
+
+    manifest = {
+        "version": STORE_VERSION,
+        "source": Path(input_path).name,
+        "signals": {name: column.finish() for name, column in columns.items()},
+        **report,
+    }
+
+    with open(store_path / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return [manifest, None]
+
+
+def _write_entry_columns(input_path: Path, store_path: Path, recover: bool):
+    columns = {}
+
+    try:
+        with open(input_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            try:
+                [report, error] = _read_entry_columns(mm, store_path, columns, recover)
+            finally:
+                mm.close()
+    except:
+        _discard_columns(columns)
+        raise
+
+    if error is not None:
+        _discard_columns(columns)
+        return [None, None, error]
+
+    return [columns, report, None]
+
+
+def _discard_columns(columns):
+    for column in columns.values():
+        column.discard()
+
+
+def _read_entry_columns(mm, store_path: Path, columns, recover: bool):
+    # Entries that can't be stored, keyed by name and type to only report them once
+    skipped = {}
+
+    invalid_records = 0
+
+    error_message = "Invalid file, verify that the file is a wpilog or try downloading the log file again. Use --recover to skip past corrupted parts of the log."
+
+    reader = DataLogReader(mm)
+
+    if not reader:
+        return [None, error_message]
+
+    # Skip past corrupted and truncated regions instead of stopping at them
+    records = reader.recover() if recover else iter(reader)
+
+    # Maps entry ids to the column writer of their signal
+    entries = {}
+
+    for record in records:
+        if record.isStart():
+            try:
+                data = record.getStartData()
+            except (TypeError, UnicodeDecodeError):
+                if not recover:
+                    return [None, error_message]
+
+                invalid_records += 1
+                continue
+
+            entries[data.entry] = None
+
+            if data.type not in SCALAR_DTYPES and data.type not in ARRAY_DTYPES:
+                skipped[(data.name, data.type)] = "unsupported type"
+                continue
+
+            if data.name not in columns:
+                columns[data.name] = _ColumnWriter(
+                    store_path, f"{len(columns):04d}", data.type
+                )
+
+            # A signal's columns can only hold a single type
+            if columns[data.name].type != data.type:
+                skipped[(data.name, data.type)] = "type changed after restart"
+                continue
+
+            entries[data.entry] = columns[data.name]
+
+        elif record.isFinish():
+            entries.pop(record.getFinishEntry(), None)
+
+        elif record.isControl():
+            continue
+
+        else:
+            column = entries.get(record.entry, None)
+
+            if column is not None and not column.append(record):
+                invalid_records += 1
+
+    report = {
+        "skipped": [
+            {"name": name, "type": entry_type, "reason": reason}
+            for (name, entry_type), reason in skipped.items()
+        ],
+        "invalid_records": invalid_records,
+    }
+
+    if recover:
+        report["skipped_bytes"] = records.skippedBytes
+        report["skipped_regions"] = records.skippedRegions
+        report["invalid_records"] += records.skippedRecords
+    else:
+        # The default reader stops at the first record it can't read
+        report["unread_bytes"] = len(mm) - records.pos
+
+    return [report, None]
+
+
+class _ColumnWriter:
+    """Buffers the records of a single signal and appends them to temporary files, so
+    the whole log never has to be held in memory while writing a store."""
+
+    def __init__(self, store_path: Path, prefix: str, entry_type: str):
+        self.store_path = store_path
+        self.prefix = prefix
+        self.type = entry_type
+        self.dtype = SCALAR_DTYPES.get(entry_type, None) or ARRAY_DTYPES[entry_type]
+        self.itemsize = np.dtype(self.dtype).itemsize
+        self.count = 0
+
+        # Values, element counts per record and string sizes of string[] elements
+        self.buffers = {
+            "timestamps": bytearray(),
+            "values": bytearray(),
+            "lengths": bytearray(),
+            "element_lengths": bytearray(),
+        }
+
+        self.discard()
+
+    def append(self, record: DataLogRecord):
+        data = record.data
+
+        if self.type == STRING_ARRAY_TYPE:
+            try:
+                elements = [value.encode() for value in record.getStringArray()]
+            except (TypeError, UnicodeDecodeError):
+                return False
+
+            for element in elements:
+                self.buffers["values"] += element
+                self.buffers["element_lengths"] += _int_bytes(len(element))
+
+            self.buffers["lengths"] += _int_bytes(len(elements))
+
+        # Skip malformed records instead of corrupting the column
+        elif self.type in SCALAR_DTYPES:
+            if len(data) != self.itemsize:
+                return False
+
+            self.buffers["values"] += data
+
+        else:
+            if len(data) % self.itemsize != 0:
+                return False
+
+            # Strings are decoded when read, so only store valid text
+            if self.type in ("string", "json"):
+                try:
+                    str(data, encoding="utf-8")
+                except UnicodeDecodeError:
+                    return False
+
+            self.buffers["values"] += data
+            self.buffers["lengths"] += _int_bytes(len(data) // self.itemsize)
+
+        # Timestamps are unsigned in the log
+        self.buffers["timestamps"] += record.timestamp.to_bytes(
+            8, byteorder="little", signed=False
+        )
+        self.count += 1
+
+        if (
+            len(self.buffers["values"]) >= FLUSH_SIZE
+            or len(self.buffers["timestamps"]) >= FLUSH_SIZE
+        ):
+            self.flush()
+
+        return True
+
+    def flush(self):
+        for column, buffer in self.buffers.items():
+            if len(buffer) > 0:
+                with open(self._temp_path(column), "ab") as f:
+                    f.write(buffer)
+
+                buffer.clear()
+
+    def finish(self):
+        """Writes the .npy files of the signal and returns its manifest entry."""
+        self.flush()
+
+        files = {"timestamps": f"{self.prefix}.timestamps.npy"}
+
+        timestamps = self._read_temp("timestamps", "<u8")
+        values = self._read_temp("values", self.dtype)
+
+        # Records are almost always in time order, only sort when needed
+        order = None
+        if np.any(timestamps[1:] < timestamps[:-1]):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps = timestamps[order]
+
+        np.save(self.store_path / files["timestamps"], timestamps)
+
+        if self.type in SCALAR_DTYPES:
+            if order is not None:
+                values = values[order]
+        else:
+            offsets = _lengths_to_offsets(self._read_temp("lengths", "<i8"))
+
+            if self.type == STRING_ARRAY_TYPE:
+                element_offsets = _lengths_to_offsets(
+                    self._read_temp("element_lengths", "<i8")
+                )
+
+            if order is not None:
+                [index, offsets] = _reorder_segments(offsets, order)
+
+                if self.type == STRING_ARRAY_TYPE:
+                    [index, element_offsets] = _reorder_segments(element_offsets, index)
+
+                values = values[index]
+
+            files["offsets"] = f"{self.prefix}.offsets.npy"
+            np.save(self.store_path / files["offsets"], offsets)
+
+            if self.type == STRING_ARRAY_TYPE:
+                files["element_offsets"] = f"{self.prefix}.element_offsets.npy"
+                np.save(self.store_path / files["element_offsets"], element_offsets)
+
+        files["values"] = f"{self.prefix}.values.npy"
+        np.save(self.store_path / files["values"], values)
+
+        size = len(values)
+
+        del timestamps, values
+
+        self.discard()
+
+        return {"type": self.type, "count": self.count, "size": size, "files": files}
+
+    def discard(self):
+        for column in self.buffers:
+            self._temp_path(column).unlink(missing_ok=True)
+
+    def _temp_path(self, column: str):
+        return self.store_path / f"{self.prefix}.{column}.tmp"
+
+    def _read_temp(self, column: str, dtype: str):
+        path = self._temp_path(column)
+
+        # Empty files can't be memory-mapped
+        if not path.is_file() or path.stat().st_size == 0:
+            return np.empty(0, dtype=dtype)
+
+        return np.memmap(path, dtype=dtype, mode="r")
+
+
+def _int_bytes(value: int):
+    return value.to_bytes(8, byteorder="little", signed=True)
+
+
+def _lengths_to_offsets(lengths):
+    offsets = np.zeros(len(lengths) + 1, dtype="<i8")
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _reorder_segments(offsets, order):
+    """Returns the indices that gather the segments of a flat column in the given
+    order, along with the offsets of the reordered segments."""
+    lengths = np.diff(offsets)[order]
+    new_offsets = _lengths_to_offsets(lengths)
+    index = np.repeat(offsets[:-1][order] - new_offsets[:-1], lengths) + np.arange(
+        new_offsets[-1]
+    )
+    return [index, new_offsets]
+
+
+class SignalStore:
+    """Signal Store gives zero-copy access to a directory written by write_signal_store.
+
+    Columns are memory-mapped on first use, so separate processes reading the same
+    store share a single copy of the data in the page cache."""
+
+    def __init__(self, store_path: Path):
+        self.store_path = Path(store_path)
+
+        with open(self.store_path / MANIFEST_NAME, "r") as f:
+            self.manifest = json.load(f)
+
+        self.signals = self.manifest["signals"]
+        self._columns = {}
+
+    def names(self):
+        return list(self.signals.keys())
+
+    def get_type(self, name: str):
+        return self.signals[name]["type"]
+
+    def get_timestamps(self, name: str):
+        """Returns the timestamps of a signal in microseconds."""
+        return self._load_column(name, "timestamps")
+
+    def get(self, name: str, start: float = None, end: float = None):
+        """Returns the timestamps (in microseconds) and values of a signal with a
+        timestamp between start and end, given in seconds.
+
+        Scalar signals return a memory-mapped array of values, while array and string
+        signals return a list with one memory-mapped array per record. string[] signals
+        return a list of memory-mapped arrays per record, one for each string."""
+        timestamps = self.get_timestamps(name)
+
+        first = 0 if start is None else np.searchsorted(timestamps, start * 1000000)
+        last = (
+            len(timestamps)
+            if end is None
+            else np.searchsorted(timestamps, end * 1000000, side="right")
+        )
+
+        values = self._load_column(name, "values")
+
+        if "offsets" not in self.signals[name]["files"]:
+            return [timestamps[first:last], values[first:last]]
+
+        offsets = self._load_column(name, "offsets")
+
+        if self.get_type(name) == STRING_ARRAY_TYPE:
+            element_offsets = self._load_column(name, "element_offsets")
+
+            return [
+                timestamps[first:last],
+                [
+                    [
+                        values[element_offsets[j] : element_offsets[j + 1]]
+                        for j in range(offsets[i], offsets[i + 1])
+                    ]
+                    for i in range(first, last)
+                ],
+            ]
+
+        return [
+            timestamps[first:last],
+            [values[offsets[i] : offsets[i + 1]] for i in range(first, last)],
+        ]
+
+    def to_dataframe(
+        self, name_filter: str = None, start: float = None, end: float = None
+    ):
+        """Builds a dataframe in the same layout as read_log_to_dataframe, only loading
+        the values of the given signal between start and end, given in seconds."""
+        from cougar_log.log_helpers import HEADER_LIST
+
+        frames = []
+
+        for name in self.names() if name_filter is None else [name_filter]:
+            if name not in self.signals:
+                continue
+
+            [timestamps, values] = self.get(name, start, end)
+
+            frames.append(
+                pd.DataFrame(
+                    {
+                        HEADER_LIST[0]: timestamps / 1000000,
+                        HEADER_LIST[1]: name,
+                        HEADER_LIST[2]: self._to_python_values(name, values),
+                    }
+                )
+            )
+
+        if len(frames) == 0:
+            return pd.DataFrame(columns=HEADER_LIST)
+
+        return (
+            pd.concat(frames, ignore_index=True)
+            .sort_values(HEADER_LIST[0], kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def _to_python_values(self, name: str, values):
+        match self.get_type(name):
+            case "int64" if name == "systemTime":
+                return [
+                    "{:%Y-%m-%d %H:%M:%S.%f}".format(
+                        datetime.fromtimestamp(value / 1000000)
+                    )
+                    for value in values.tolist()
+                ]
+            case "boolean":
+                return (values != 0).tolist()
+            case "boolean[]":
+                return [(value != 0).tolist() for value in values]
+            case "string" | "json":
+                return [str(value.tobytes(), encoding="utf-8") for value in values]
+            case "string[]":
+                return [
+                    [str(element.tobytes(), encoding="utf-8") for element in value]
+                    for value in values
+                ]
+            case "double" | "float" | "int64":
+                return values.tolist()
+            case _:
+                return [value.tolist() for value in values]
+
+    def _load_column(self, name: str, column: str):
+        key = (name, column)
+
+        if key not in self._columns:
+            path = self.store_path / self.signals[name]["files"][column]
+
+            # Empty arrays can't be memory-mapped
+            try:
+                self._columns[key] = np.load(path, mmap_mode="r")
+            except ValueError:
+                self._columns[key] = np.load(path)
+
+        return self._columns[key]
@@ -6,20 +6,93 @@ class RobotSSHInterface:
     """Robot SSH Interface enables remote communcation with the robot for downloading files."""
 
     def __init__(
-        self, host: str, user: str, password: str, port: int, remove_files: bool
+        self,
+        host: str,
+        user: str,
+        password: str,
+        port: int,
+        remove_files: bool,
+        timeout: float = 10.0,
     ):
         self.remove_files = remove_files
 
-        connect_kwargs = {} if password is None else {"password": password}
+        self.host = host
+        self.user = user
+        self.port = port
+        self.connect_kwargs = {} if password is None else {"password": password}
 
+        # Seconds to wait on an unresponsive robot before giving up
+        self.timeout = timeout
+
+        self.connect()
+
+    def connect(self):
         # Create an ssh connection to the robot
         self.connection = Connection(
-            host=host, user=user, port=port, connect_kwargs=connect_kwargs
+            host=self.host,
+            user=self.user,
+            port=self.port,
+            connect_timeout=self.timeout,
+            connect_kwargs=self.connect_kwargs,
         )
 
         # Connect to the robot's file system
         self.sftp = self.connection.sftp()
 
+        # A robot that loses power never closes the connection, so detect dead links
+        # with keepalives and make blocked reads fail instead of hanging forever
+        self.connection.transport.set_keepalive(max(1, int(self.timeout / 2)))
+        self.sftp.get_channel().settimeout(self.timeout)
+
+    def is_connected(self):
+        return self.connection.is_connected
+
+    def list_log_files(self, source_directory: str):
+        """Returns a dictionary of the log files in the given directory mapped to their
+        size and modification time."""
+        return {
+            attributes.filename: (attributes.st_size, attributes.st_mtime)
+            for attributes in self.sftp.listdir_attr(source_directory)
+            if attributes.filename.endswith(".wpilog")
+        }
+
+    def download_file(
+        self, source_directory: str, file_name: str, target_directory: str, offset=0
+    ):
+        """Downloads a single file, only transferring the bytes after offset when
+        the start of the file has already been downloaded."""
+        remote_file_path = str(PurePosixPath(source_directory, file_name))
+
+        local_path = Path(target_directory, file_name)
+
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if offset == 0 or not local_path.is_file():
+            self.sftp.get(remote_file_path, str(local_path))
+            return
+
+        with self.sftp.open(remote_file_path, "rb") as remote_file, open(
+            local_path, "r+b"
+        ) as local_file:
+            remote_file.seek(offset)
+            remote_file.prefetch()
+
+            local_file.seek(offset)
+            local_file.truncate()
+
+            while chunk := remote_file.read(32768):
+                local_file.write(chunk)
+
+    def read_file(self, source_directory: str, file_name: str, offset: int, size: int):
+        with self.sftp.open(
+            str(PurePosixPath(source_directory, file_name)), "rb"
+        ) as remote_file:
+            remote_file.seek(offset)
+            return remote_file.read(size)
+
+    def remove_file(self, source_directory: str, file_name: str):
+        self.sftp.remove(str(PurePosixPath(source_directory, file_name)))
+
     def download_from_directory(
         self, source_directory: str, target_directory: str, remove: bool
     ):
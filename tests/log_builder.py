@@ -0,0 +1,80 @@
+import struct
+
+
+def _encode_int(value: int, length: int = None):
+    if length is None:
+        length = max(1, (value.bit_length() + 7) // 8)
+    return value.to_bytes(length, byteorder="little", signed=False)
+
+
+def _encode_string(value: str):
+    data = value.encode()
+    return _encode_int(len(data), 4) + data
+
+
+def record(entry: int, timestamp: int, data: bytes):
+    """Encodes a record using the shortest possible field lengths, like DataLog does."""
+    entry_bytes = _encode_int(entry)
+    size_bytes = _encode_int(len(data))
+    timestamp_bytes = _encode_int(timestamp)
+    header = (
+        (len(entry_bytes) - 1)
+        | ((len(size_bytes) - 1) << 2)
+        | ((len(timestamp_bytes) - 1) << 4)
+    )
+    return bytes([header]) + entry_bytes + size_bytes + timestamp_bytes + data
+
+
+def start(entry: int, name: str, type: str, timestamp: int = 0):
+    data = bytes([0]) + _encode_int(entry, 4)
+    data += _encode_string(name) + _encode_string(type) + _encode_string("")
+    return record(0, timestamp, data)
+
+
+def finish(entry: int, timestamp: int = 0):
+    return record(0, timestamp, bytes([1]) + _encode_int(entry, 4))
+
+
+def double(value: float):
+    return struct.pack("<d", value)
+
+
+def int64(value: int):
+    return struct.pack("<q", value)
+
+
+def double_array(values):
+    return struct.pack(f"<{len(values)}d", *values)
+
+
+def string_array(values):
+    return _encode_int(len(values), 4) + b"".join(_encode_string(v) for v in values)
+
+
+def build_log(*records: bytes):
+    return b"WPILOG" + _encode_int(0x0100, 2) + _encode_int(0, 4) + b"".join(records)
+
+
+def sample_log(count: int = 20):
+    """Returns a log with one signal of every commonly used type."""
+    records = [
+        start(1, "/drive/speed", "double"),
+        start(2, "/flag", "boolean"),
+        start(3, "/msg", "string"),
+        start(4, "/arr", "double[]"),
+        start(5, "/names", "string[]"),
+        start(6, "/count", "int64"),
+    ]
+
+    for i in range(count):
+        timestamp = (i + 1) * 20000
+        records += [
+            record(1, timestamp, double(i * 1.5)),
+            record(2, timestamp + 1, bytes([i % 2])),
+            record(3, timestamp + 2, f"message {i}".encode()),
+            record(4, timestamp + 3, double_array(range(i % 4))),
+            record(5, timestamp + 4, string_array([f"a{i}", "", "b"][: i % 4])),
+            record(6, timestamp + 5, int64(i - 10)),
+        ]
+
+    return build_log(*records)
@@ -0,0 +1,135 @@
+from cougar_log.data_log_reader import DataLogReader
+from cougar_log.log_helpers import convert_data_log_to_list
+from tests.log_builder import build_log, double, int64, record, sample_log, start
+
+
+def read_records(log: bytes):
+    iterator = DataLogReader(log).recover()
+    records = [(r.entry, r.timestamp, bytes(r.data)) for r in iterator]
+    return [records, iterator]
+
+
+def clean_records(log: bytes):
+    return [(r.entry, r.timestamp, bytes(r.data)) for r in DataLogReader(log)]
+
+
+def two_signal_records(count: int):
+    records = [start(1, "/first", "double"), start(2, "/second", "int64")]
+    for i in range(count):
+        records.append(
+            record(1 + i % 2, 1000 + i * 100, double(i) if i % 2 == 0 else int64(i))
+        )
+    return records
+
+
+def test_clean_log_matches(tmp_path):
+    log_path = tmp_path / "clean.wpilog"
+    log_path.write_bytes(sample_log())
+
+    [records, iterator] = read_records(sample_log())
+
+    assert records == clean_records(sample_log())
+    assert iterator.skippedBytes == 0
+    assert iterator.skippedRegions == 0
+    assert iterator.skippedRecords == 0
+    assert convert_data_log_to_list(log_path) == convert_data_log_to_list(
+        log_path, recover=True
+    )
+
+
+def test_truncated_tail():
+    records = two_signal_records(10)
+    log = build_log(*records)[:-3]
+
+    [recovered, iterator] = read_records(log)
+
+    assert recovered == clean_records(log)
+    assert len(recovered) == len(records) - 1
+    assert iterator.skippedBytes == len(records[-1]) - 3
+    assert iterator.skippedRegions == 1
+
+
+def test_corrupted_middle():
+    records = two_signal_records(100)
+    corrupted = records[:50] + [b"\xff" * len(records[50])] + records[51:]
+
+    [recovered, iterator] = read_records(build_log(*corrupted))
+
+    assert recovered == clean_records(build_log(*records[:50] + records[51:]))
+    assert iterator.skippedBytes == len(records[50])
+    assert iterator.skippedRegions == 1
+
+    # The clean iterator can't get past the corrupted record
+    assert len(clean_records(build_log(*corrupted))) == 50
+
+
+def test_corrupted_start_record(tmp_path):
+    records = two_signal_records(2000)
+    corrupted = bytearray(build_log(*records))
+    corrupted[12] = 0xFF
+    log_path = tmp_path / "corrupted.wpilog"
+    log_path.write_bytes(corrupted)
+
+    [recovered, iterator] = read_records(bytes(corrupted))
+
+    assert len(recovered) == 1 + 1000
+    assert iterator.skippedBytes == len(records[0])
+    assert iterator.skippedRegions == 1
+    assert iterator.skippedRecords == 1000
+
+    [output, error] = convert_data_log_to_list(log_path, recover=True)
+
+    assert error is None
+    assert len(output) == 1000
+    assert {name for _, name, _ in output} == {"/second"}
+
+
+def timestamped_records(count: int):
+    # Four byte timestamps, so flipping a bit of the top byte jumps by minutes
+    records = [start(1, "/first", "double"), start(2, "/second", "int64")]
+    for i in range(count):
+        timestamp = 20000000 + i * 1000
+        data = double(i) if i % 2 == 0 else int64(i)
+        records.append(record(1 + i % 2, timestamp, data))
+    return records
+
+
+def flip_timestamp(records, index: int):
+    log = bytearray(build_log(*records))
+    pos = 12 + sum(len(r) for r in records[:index])
+    # One byte each for the header, entry and size, then the top timestamp byte
+    log[pos + 3 + 3] ^= 0x40
+    return bytes(log)
+
+
+def test_corrupted_timestamp():
+    records = timestamped_records(2000)
+
+    for index in (2, 1000):
+        [recovered, iterator] = read_records(flip_timestamp(records, index))
+
+        assert len(recovered) == len(records) - 1
+        assert iterator.skippedBytes == 0
+        assert iterator.skippedRegions == 0
+        assert iterator.skippedRecords == 1
+
+
+def test_zero_filled_tail():
+    records = timestamped_records(100)
+
+    [recovered, iterator] = read_records(build_log(*records) + bytes(1 << 20))
+
+    assert len(recovered) == len(records)
+    assert iterator.skippedBytes == 1 << 20
+    assert iterator.skippedRegions == 1
+
+
+def test_invalid_start_name(tmp_path):
+    log = bytearray(build_log(*timestamped_records(10)))
+    log[log.index(b"/first")] = 0xFF
+    log_path = tmp_path / "bad.wpilog"
+    log_path.write_bytes(log)
+
+    [_, error] = convert_data_log_to_list(log_path)
+
+    assert "--recover" in error
@@ -0,0 +1,175 @@
+import os
+import shutil
+from types import SimpleNamespace
+
+from cougar_log.log_watcher import RobotLogWatcher
+from cougar_log.ssh_download import RobotSSHInterface
+from tests.log_builder import sample_log
+
+
+class LocalSFTP:
+    """Stands in for a paramiko SFTP client by serving files from a local directory."""
+
+    def __init__(self, calls):
+        self.calls = calls
+
+    def listdir_attr(self, path):
+        return [
+            SimpleNamespace(
+                filename=name,
+                st_size=os.stat(os.path.join(path, name)).st_size,
+                st_mtime=os.stat(os.path.join(path, name)).st_mtime,
+            )
+            for name in os.listdir(path)
+        ]
+
+    def get(self, remote_path, local_path):
+        self.calls.append(("get", remote_path))
+        shutil.copyfile(remote_path, local_path)
+
+    def open(self, remote_path, mode):
+        self.calls.append(("open", remote_path))
+        remote_file = open(remote_path, mode)
+        remote_file.prefetch = lambda: None
+        return remote_file
+
+    def remove(self, remote_path):
+        self.calls.append(("remove", remote_path))
+        os.remove(remote_path)
+
+
+class LocalInterface(RobotSSHInterface):
+    def __init__(self):
+        self.calls = []
+        self.connections = 0
+        super().__init__("localhost", "lvuser", "", 22, remove_files=False)
+
+    def connect(self):
+        self.connections += 1
+        self.connection = SimpleNamespace(is_connected=True)
+        self.connection.close = lambda: setattr(self.connection, "is_connected", False)
+        self.sftp = LocalSFTP(self.calls)
+
+
+def create_watcher(tmp_path, remove_files=False, remove_delay=0):
+    (tmp_path / "robot").mkdir(exist_ok=True)
+    interface = LocalInterface()
+    watcher = RobotLogWatcher(
+        lambda: interface,
+        source_directory=str(tmp_path / "robot"),
+        target_directory=str(tmp_path / "logs"),
+        remove_files=remove_files,
+        remove_delay=remove_delay,
+        on_event=lambda message: None,
+    )
+    return [watcher, interface]
+
+
+def write_remote(tmp_path, data, mode="wb", mtime=1000, name="match.wpilog"):
+    path = tmp_path / "robot" / name
+    with open(path, mode) as f:
+        f.write(data)
+    os.utime(path, (mtime, mtime))
+
+
+def test_downloads_only_after_file_is_stable(tmp_path):
+    [watcher, _] = create_watcher(tmp_path)
+    write_remote(tmp_path, sample_log())
+
+    assert watcher.poll() == []
+    assert not (tmp_path / "logs" / "match.wpilog").exists()
+
+    assert watcher.poll() == ["match.wpilog"]
+    assert (tmp_path / "logs" / "match.wpilog").read_bytes() == sample_log()
+
+    assert watcher.poll() == []
+
+
+def test_appends_to_grown_file(tmp_path):
+    [watcher, interface] = create_watcher(tmp_path)
+    log = sample_log()
+    write_remote(tmp_path, log[:500])
+    watcher.poll()
+    watcher.poll()
+
+    write_remote(tmp_path, log[500:], mode="ab", mtime=2000)
+
+    assert watcher.poll() == []
+    assert watcher.poll() == ["match.wpilog"]
+    assert (tmp_path / "logs" / "match.wpilog").read_bytes() == log
+    assert [call[0] for call in interface.calls] == ["get", "open"]
+
+
+def test_removes_only_after_download(tmp_path):
+    [watcher, interface] = create_watcher(tmp_path, remove_files=True)
+    write_remote(tmp_path, sample_log())
+    write_remote(tmp_path, sample_log(), mtime=2000, name="newer.wpilog")
+
+    watcher.poll()
+    assert "remove" not in [call[0] for call in interface.calls]
+
+    assert sorted(watcher.poll()) == ["match.wpilog", "newer.wpilog"]
+    assert not (tmp_path / "robot" / "match.wpilog").exists()
+    assert (tmp_path / "logs" / "match.wpilog").read_bytes() == sample_log()
+
+
+def test_never_removes_newest_log(tmp_path):
+    [watcher, _] = create_watcher(tmp_path, remove_files=True)
+    write_remote(tmp_path, sample_log())
+
+    for _ in range(3):
+        watcher.poll()
+
+    assert (tmp_path / "robot" / "match.wpilog").exists()
+
+
+def test_waits_before_removing(tmp_path):
+    [watcher, _] = create_watcher(tmp_path, remove_files=True, remove_delay=3600)
+    write_remote(tmp_path, sample_log())
+    write_remote(tmp_path, sample_log(), mtime=2000, name="newer.wpilog")
+
+    for _ in range(3):
+        watcher.poll()
+
+    assert (tmp_path / "robot" / "match.wpilog").exists()
+
+
+def test_keeps_files_already_saved_locally(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "match.wpilog").write_bytes(sample_log())
+    [watcher, interface] = create_watcher(tmp_path, remove_files=True)
+    write_remote(tmp_path, sample_log())
+    write_remote(tmp_path, sample_log(), mtime=2000, name="newer.wpilog")
+
+    for _ in range(10):
+        watcher.poll()
+
+    assert (tmp_path / "robot" / "match.wpilog").exists()
+    assert "remove" not in [call[0] for call in interface.calls]
+
+    # Matching local files are only compared with the robot's file once
+    assert sorted(call[0] for call in interface.calls) == ["get", "open", "open"]
+
+
+def test_skips_unrelated_local_file(tmp_path):
+    (tmp_path / "logs").mkdir()
+    (tmp_path / "logs" / "match.wpilog").write_bytes(b"not a robot log")
+    [watcher, interface] = create_watcher(tmp_path, remove_files=True)
+    write_remote(tmp_path, sample_log())
+
+    watcher.poll()
+
+    assert watcher.poll() == []
+    assert (tmp_path / "logs" / "match.wpilog").read_bytes() == b"not a robot log"
+    assert (tmp_path / "robot" / "match.wpilog").exists()
+
+
+def test_reconnects_same_interface(tmp_path):
+    [watcher, interface] = create_watcher(tmp_path)
+    watcher.poll()
+
+    watcher.close()
+    watcher.poll()
+
+    assert watcher.interface is interface
+    assert interface.connections == 2
@@ -0,0 +1,162 @@
+import numpy as np
+
+from cougar_log.log_helpers import read_log_to_dataframe
+from cougar_log.signal_store import SignalStore, write_signal_store
+from tests.log_builder import (
+    build_log,
+    double,
+    record,
+    sample_log,
+    start,
+    string_array,
+)
+
+
+def write_store(tmp_path, log: bytes):
+    log_path = tmp_path / "test.wpilog"
+    log_path.write_bytes(log)
+
+    [manifest, error] = write_signal_store(log_path, tmp_path / "store")
+
+    assert error is None
+
+    return [log_path, tmp_path / "store", manifest["skipped"]]
+
+
+def test_store_matches_log(tmp_path):
+    [log_path, store_path, skipped] = write_store(tmp_path, sample_log())
+
+    [log_dataframe, error] = read_log_to_dataframe(log_path)
+    [store_dataframe, _] = read_log_to_dataframe(store_path)
+
+    assert error is None
+    assert skipped == []
+    assert store_dataframe.values.tolist() == log_dataframe.values.tolist()
+
+
+def test_store_filter(tmp_path):
+    [log_path, store_path, _] = write_store(tmp_path, sample_log())
+
+    [log_dataframe, _] = read_log_to_dataframe(log_path, name_filter="/names")
+    [store_dataframe, _] = read_log_to_dataframe(store_path, name_filter="/names")
+
+    assert len(store_dataframe) == 20
+    assert store_dataframe.values.tolist() == log_dataframe.values.tolist()
+
+
+def test_store_time_slice(tmp_path):
+    [_, store_path, _] = write_store(tmp_path, sample_log())
+    store = SignalStore(store_path)
+
+    [timestamps, values] = store.get("/drive/speed", 0.1, 0.2)
+
+    assert isinstance(values, np.memmap)
+    assert timestamps.tolist() == [100000, 120000, 140000, 160000, 180000, 200000]
+    assert values.tolist() == [6.0, 7.5, 9.0, 10.5, 12.0, 13.5]
+
+    [_, values] = store.get("/arr", 0.06, 0.1)
+
+    assert [value.tolist() for value in values] == [[0.0, 1.0], [0.0, 1.0, 2.0]]
+
+
+def test_store_sorts_out_of_order_records(tmp_path):
+    log = build_log(
+        start(1, "/speed", "double"),
+        start(2, "/names", "string[]"),
+        record(1, 300, double(3.0)),
+        record(2, 300, string_array(["c", "cc"])),
+        record(1, 100, double(1.0)),
+        record(2, 100, string_array(["a"])),
+        record(1, 200, double(2.0)),
+        record(2, 200, string_array([])),
+    )
+    [_, store_path, _] = write_store(tmp_path, log)
+    store = SignalStore(store_path)
+
+    assert store.get("/speed")[1].tolist() == [1.0, 2.0, 3.0]
+    assert store.to_dataframe("/names")["Value"].tolist() == [["a"], [], ["c", "cc"]]
+
+
+def test_store_reports_skipped_entries(tmp_path):
+    log = build_log(
+        start(1, "/value", "double"),
+        record(1, 100, double(1.0)),
+        start(2, "/value", "string"),
+        record(2, 200, b"text"),
+        start(3, "/raw", "raw"),
+        record(3, 300, b"\x01\x02"),
+    )
+    [_, store_path, skipped] = write_store(tmp_path, log)
+
+    assert skipped == [
+        {"name": "/value", "type": "string", "reason": "type changed after restart"},
+        {"name": "/raw", "type": "raw", "reason": "unsupported type"},
+    ]
+    assert SignalStore(store_path).manifest["skipped"] == skipped
+    assert list(store_path.glob("*.tmp")) == []
+
+
+def test_store_time_filter(tmp_path):
+    [log_path, store_path, _] = write_store(tmp_path, sample_log())
+
+    [log_dataframe, _] = read_log_to_dataframe(log_path, start=0.1, end=0.2)
+    [store_dataframe, _] = read_log_to_dataframe(store_path, start=0.1, end=0.2)
+
+    assert len(store_dataframe) == 6 * 5 + 1
+    assert store_dataframe.values.tolist() == log_dataframe.values.tolist()
+
+
+def test_store_skips_invalid_strings(tmp_path):
+    log = build_log(
+        start(1, "/msg", "string"),
+        record(1, 100, b"ok"),
+        record(1, 200, b"\xff\xfe"),
+        record(1, 300, b"fine"),
+    )
+    [_, store_path, _] = write_store(tmp_path, log)
+    store = SignalStore(store_path)
+
+    assert store.manifest["invalid_records"] == 1
+    assert store.to_dataframe()["Value"].tolist() == ["ok", "fine"]
+
+
+def test_store_reports_truncated_log(tmp_path):
+    log_path = tmp_path / "test.wpilog"
+    log_path.write_bytes(sample_log()[:-3])
+
+    [manifest, _] = write_signal_store(log_path, tmp_path / "store")
+
+    unread_bytes = manifest["unread_bytes"]
+
+    assert unread_bytes > 0
+
+    [manifest, _] = write_signal_store(log_path, tmp_path / "store", recover=True)
+
+    assert manifest["skipped_bytes"] == unread_bytes
+    assert manifest["skipped_regions"] == 1
+
+
+def test_store_recovers_corrupted_start(tmp_path):
+    log = bytearray(
+        build_log(
+            start(1, "/first", "double"),
+            start(2, "/second", "double"),
+            record(1, 100, double(1.0)),
+            record(2, 100, double(2.0)),
+        )
+    )
+    # Corrupt the name of the first start record
+    log[log.index(b"/first")] = 0xFF
+    log_path = tmp_path / "test.wpilog"
+    log_path.write_bytes(log)
+
+    [manifest, error] = write_signal_store(log_path, tmp_path / "failed")
+
+    assert error is not None
+    assert not (tmp_path / "failed").exists()
+
+    [manifest, error] = write_signal_store(log_path, tmp_path / "store", recover=True)
+
+    assert error is None
+    assert list(manifest["signals"].keys()) == ["/second"]
+    assert list((tmp_path / "store").glob("*.tmp")) == []